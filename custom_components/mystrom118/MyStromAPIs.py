@@ -1,32 +1,96 @@
 """Integration: MyStrom Button Plus; Contains class that listens for WebSocket events."""
 
 import asyncio
+from collections.abc import Callable
 import json
 import logging
-
-from aiohttp import ClientConnectorError, ClientSession, WSMsgType
+import random
+import time
+
+from aiohttp import (
+    ClientConnectionError,
+    ClientConnectorError,
+    ClientError,
+    ClientResponseError,
+    ClientSession,
+    WSMsgType,
+)
 import requests as r
 import json
+from yarl import URL
+
+from .codec import ENCODING_AUTO, available_protocols, decode
+from .profiler import MyStromProfiler
 
 _LOGGER = logging.getLogger(__name__)
 
+QUEUE_SIZE = 1000
+RECONNECT_DELAY = 10
+
 
 class MyStromListener:
     """Listens to MyStrom Translator WebSocket."""
 
-    def __init__(self, url, session: ClientSession, loop: asyncio.AbstractEventLoop):
+    def __init__(
+        self,
+        url,
+        session: ClientSession,
+        loop: asyncio.AbstractEventLoop,
+        profiler: MyStromProfiler | None = None,
+        encoding: str = ENCODING_AUTO,
+        compress: bool = True,
+    ):
         """Initialize MyStromListener."""
 
         self.url = url
         self.session = session
         self.el = loop
+        self.profiler = profiler or MyStromProfiler()
+        self.protocols = available_protocols(encoding)
+        self.compress = compress
         self.callbacks = []
         self.should_continue = True
+        self.task = None
+        self.dispatcher = None
+        self.reconnect_delay = RECONNECT_DELAY
+        self.queue: asyncio.Queue = asyncio.Queue(QUEUE_SIZE)
+        self.first_connect = None
+        self.connects = 0
+        self.messages = 0
+        self.dropped = 0
+
+    def add_callback(self, cb) -> Callable[[], None]:
+        """Register a callback; returns a function that removes it again."""
+        self.callbacks.append(cb)
+
+        def remove():
+            if cb in self.callbacks:
+                self.callbacks.remove(cb)
+
+        return remove
 
     def kill(self):
         """Stop execution of Listener."""
         self.should_continue = False
-        self.task.cancel()
+        if self.task is not None:
+            self.task.cancel()
+        if self.dispatcher is not None:
+            self.dispatcher.cancel()
+
+    async def async_stop(self, timeout: float):
+        """Stop reading and give queued frames up to timeout seconds to finish."""
+        self.should_continue = False
+        if self.task is not None:
+            self.task.cancel()
+
+        try:
+            await asyncio.wait_for(self.queue.join(), timeout)
+        except asyncio.TimeoutError:
+            _LOGGER.warning(
+                "Dropping %s queued WebSocket frames on shutdown", self.queue.qsize()
+            )
+
+        self.kill()
 
     def create_loop_task(self, old_task=None):
         """Run Event Loop Task for Listening."""
@@ -34,6 +98,11 @@ class MyStromListener:
         if not self.should_continue:
             return
 
+        if self.dispatcher is None:
+            self.dispatcher = self.el.create_task(
+                self._run_dispatcher(), name="MyStromDeviceDispatcher"
+            )
+
         self.task = self.el.create_task(
             self._run_for_data(), name="MyStromDeviceListener"
         )
@@ -43,20 +112,47 @@ class MyStromListener:
         """Awaits WebSocket Data and posts to callback."""
 
         try:
-            async with self.session.ws_connect(self.url) as ws:
+            # Both the subprotocol and permessage-deflate are only offered,
+            # translators that don't know them keep talking plain JSON
+            async with self.session.ws_connect(
+                self.url,
+                protocols=self.protocols,
+                compress=15 if self.compress else 0,
+            ) as ws:
+                self.connects += 1
+                if self.first_connect is None:
+                    self.first_connect = time.monotonic()
+                _LOGGER.debug(
+                    "Connected using %s, compression %s",
+                    ws.protocol or "JSON",
+                    "on" if ws.compress else "off",
+                )
                 async for msg in ws:
                     if msg.type in (WSMsgType.CLOSED, WSMsgType.ERROR):
                         break
 
                     if msg.type in (WSMsgType.TEXT, WSMsgType.BINARY):
-                        _LOGGER.debug("New Text Message; Distributing to callbacks")
+                        _LOGGER.debug("New Message; Distributing to callbacks")
                         # _LOGGER.debug(msg)
-                        for cb in self.callbacks:
-                            await cb(msg.data)
+                        try:
+                            data = decode(msg.data, ws.protocol)
+                        except (ValueError, TypeError):
+                            self.dropped += 1
+                            _LOGGER.warning("Dropping malformed frame: %r", msg.data)
+                            continue
+
+                        self.messages += 1
+                        await self.queue.put(data)
         except ClientConnectorError:
             _LOGGER.warning(
-                "WebSocket connection failed, retrying in 10 seconds.", exc_info=True
+                "WebSocket connection failed, retrying in %s seconds.",
+                self.reconnect_delay,
+                exc_info=True,
             )
+        except (ClientError, asyncio.TimeoutError):
+            # Anything escaping here would end the task without the sleep
+            # below and re-arm it immediately, spinning on a broken translator
+            _LOGGER.warning("WebSocket connection lost.", exc_info=True)
 
         if not self.should_continue:
             _LOGGER.debug(
@@ -64,43 +160,254 @@ class MyStromListener:
             )
             return
         else:
-            _LOGGER.error("WebSocket died, retrying connection in 10 seconds.")
+            _LOGGER.error(
+                "WebSocket died, retrying connection in %s seconds.",
+                self.reconnect_delay,
+            )
 
-        await asyncio.sleep(10)
+        await asyncio.sleep(self.reconnect_delay)
         return
 
+    async def _run_dispatcher(self):
+        """Hand queued frames to the callbacks, decoupled from reading."""
+        while True:
+            data = await self.queue.get()
+            try:
+                if self.profiler.enabled:
+                    # Each callback is measured and warned about on its own
+                    with self.profiler.measure(
+                        "listener.dispatch", awaits=True, warn=False
+                    ):
+                        await self._dispatch(data)
+                else:
+                    await self._dispatch(data)
+            finally:
+                self.queue.task_done()
+
+    async def _dispatch(self, data):
+        """Distribute data to callbacks; a failing callback doesn't affect others."""
+        profiler = self.profiler if self.profiler.enabled else None
+
+        for cb in tuple(self.callbacks):
+            try:
+                if profiler is None:
+                    await cb(data)
+                    continue
+
+                with profiler.measure(f"callback.{cb.__qualname__}", awaits=True):
+                    await cb(data)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error in WebSocket callback %s", cb.__qualname__)
+
+    def as_dict(self) -> dict:
+        """Return listener statistics."""
+        return {
+            "connects": self.connects,
+            "messages": self.messages,
+            "dropped": self.dropped,
+            "callbacks": len(self.callbacks),
+            "queued": self.queue.qsize(),
+            "running": self.task is not None and not self.task.done(),
+        }
+
+
+REQUEST_TIMEOUT = 10
+REQUEST_RETRIES = 2
+RETRY_BACKOFF = 0.25
+
+
+def classify_error(err: BaseException) -> str:
+    """Map a request exception to a short outcome name."""
+    if isinstance(err, asyncio.TimeoutError):
+        return "timeout"
+    if isinstance(err, ClientResponseError):
+        return f"http_{err.status}"
+    if isinstance(err, ClientConnectionError):
+        return "connection"
+    if isinstance(err, ClientError):
+        return "client"
+    return "other"
+
+
+class EndpointStats:
+    """Latency and outcome counters of a single API endpoint."""
+
+    def __init__(self):
+        """Initialize EndpointStats."""
+        self.requests = 0
+        self.outcomes = {}
+        self.retries = 0
+        self.hedged = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def record(self, latency: float, outcome: str):
+        """Record a finished call."""
+        self.requests += 1
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+
+    def as_dict(self) -> dict:
+        """Return a serializable representation."""
+        return {
+            "requests": self.requests,
+            "outcomes": dict(self.outcomes),
+            "retries": self.retries,
+            "hedged": self.hedged,
+            "avg_latency": round(self.total_latency / self.requests, 4)
+            if self.requests
+            else None,
+            "max_latency": round(self.max_latency, 4),
+        }
+
 
 class MyStromAPI:
     """HTTP API for MyStrom Button Plus."""
 
-    def __init__(self, deviceIp: str, session: ClientSession):
-        """Initialize MyStromAPI."""
-        self.session = session
+    def __init__(
+        self,
+        deviceIp: str,
+        session: ClientSession,
+        timeout: float = REQUEST_TIMEOUT,
+        retries: int = REQUEST_RETRIES,
+        hedge_after: float | None = None,
+    ):
+        """Initialize MyStromAPI.
 
+        timeout is the deadline of a whole call including retries, split
+        between the attempts. Retries only apply to GET requests, and
+        hedge_after (if set) sends a second GET once the first one took longer
+        than that many seconds, unless the call opts out with hedge=False.
+        """
+        self.session = session
+        self.timeout = timeout
+        self.retries = retries
+        self.hedge_after = hedge_after
+        self.stats: dict[str, EndpointStats] = {}
+        self.set_host(deviceIp)
+
+    def set_host(self, deviceIp: str):
+        """Point the API at a (new) device address."""
+        self.host = deviceIp
         self.baseUrl = "http://\\device\\/api/v1".replace("\\device\\", deviceIp)
 
     async def req(
-        self, method: str, url: str, raw="", json_data: dict = {}, headers: dict = {}
+        self,
+        method: str,
+        url: str,
+        raw="",
+        json_data: dict = {},
+        headers: dict = {},
+        timeout: float | None = None,
+        retries: int | None = None,
+        hedge: bool = True,
     ):
         """Request Function."""
+        endpoint = "/" + url.split("/")[1]  # /action/generic/generic -> /action
+        stats = self.stats.setdefault(endpoint, EndpointStats())
+
+        idempotent = method.upper() == "GET"
+        if retries is None:
+            retries = self.retries if idempotent else 0
+        hedge_after = self.hedge_after if idempotent and hedge else None
+        if timeout is None:
+            timeout = self.timeout
+
+        started = time.monotonic()
+        try:
+            data = await asyncio.wait_for(
+                self._retry(
+                    stats,
+                    started + timeout,
+                    retries,
+                    hedge_after,
+                    method,
+                    url,
+                    raw,
+                    json_data,
+                    headers,
+                ),
+                timeout=timeout,
+            )
+        except Exception as err:
+            stats.record(time.monotonic() - started, classify_error(err))
+            raise
+
+        stats.record(time.monotonic() - started, "ok")
+        return data
+
+    async def _retry(
+        self, stats: EndpointStats, deadline: float, retries, hedge, *args
+    ):
+        """Send a request, retrying transient failures with jittered backoff."""
+        for attempt in range(retries + 1):
+            # Every attempt gets an equal share of what is left, so a device
+            # that accepts the connection and stalls can't use up the deadline
+            per_try = (deadline - time.monotonic()) / (retries - attempt + 1)
+            try:
+                if hedge is None:
+                    return await asyncio.wait_for(self._send(*args), per_try)
+                return await asyncio.wait_for(
+                    self._hedged(stats, hedge, *args), per_try
+                )
+            except ClientResponseError as err:
+                if err.status < 500 or attempt == retries:
+                    raise
+            except (ClientError, asyncio.TimeoutError):
+                if attempt == retries:
+                    raise
+
+            stats.retries += 1
+            await asyncio.sleep(RETRY_BACKOFF * 2**attempt * random.uniform(0.5, 1.5))
+
+    async def _hedged(self, stats: EndpointStats, hedge: float, *args):
+        """Send a request and a backup copy if the first one is slow."""
+        tasks = {asyncio.ensure_future(self._send(*args))}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge)
+            if not done:
+                stats.hedged += 1
+                tasks.add(asyncio.ensure_future(self._send(*args)))
+
+            error = None
+            while tasks:
+                done, tasks = await asyncio.wait(
+                    tasks, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _send(self, method: str, url: str, raw, json_data, headers):
+        """Send a single request."""
         url = self.baseUrl + url
 
         if raw == "" and json_data != {}:
             async with self.session.request(
                 method=method, url=url, json=json_data, headers=headers
             ) as response:
+                response.raise_for_status()
                 data = await response.text()
 
         elif json_data == {} and raw != "":
             async with self.session.request(
                 method=method, url=url, data=raw, headers=headers
             ) as response:
+                response.raise_for_status()
                 data = await response.text()
 
         else:
             async with self.session.request(
                 method=method, url=url, headers=headers
             ) as response:
+                response.raise_for_status()
                 data = await response.text()
 
         return data
@@ -108,14 +415,31 @@ class MyStromAPI:
     async def is_online(self):
         """Check if device is online."""
         try:
-            await asyncio.wait_for(self.req("GET", "/info"), timeout=5)
+            await self.req("GET", "/info", timeout=5, retries=0)
             return True
         except Exception:
             return False
 
-    async def deviceInfo(self):
+    async def probe(self, timeout: float) -> bool:
+        """Cheap reachability check that only opens a TCP connection."""
+        url = URL(self.baseUrl)
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(url.host, url.port), timeout=timeout
+            )
+        except (OSError, asyncio.TimeoutError):
+            return False
+
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+        return True
+
+    async def deviceInfo(self, timeout: float | None = None):
         """Get device information."""
-        response = await self.req("GET", "/info")
+        response = await self.req("GET", "/info", timeout=timeout)
         return json.loads(response)
 
     async def getSettings(self):
@@ -125,12 +449,13 @@ class MyStromAPI:
 
     async def setSetting(self, setting):
         """Set device setting."""
-        response = await self.req("POST", "/settings", json=setting)
+        response = await self.req("POST", "/settings", json_data=setting)
         return json.loads(response)
 
-    async def getAPsInRange(self):
+    async def getAPsInRange(self, timeout: float | None = None):
         """Get access points in range."""
-        res = await self.req("GET", "/scan")
+        # A scan takes seconds, a hedged copy would just start a second one
+        res = await self.req("GET", "/scan", timeout=timeout, hedge=False)
         res = json.loads(res)
 
         parsed: list = [
@@ -146,7 +471,7 @@ class MyStromAPI:
         return self.req(
             "POST",
             "/connect",
-            json={
+            json_data={
                 "ssid": ssid,
                 "passwd": passwd,
                 "ip": ifconfig["ip"],
@@ -1,30 +1,60 @@
 """Integration of MyStrom Button Plus."""
 
+import logging
+import time
+
 import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import EVENT_HOMEASSISTANT_STOP, HomeAssistant
+from homeassistant.core import EVENT_HOMEASSISTANT_STOP, Event, HomeAssistant
 from homeassistant.helpers.aiohttp_client import async_create_clientsession
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.typing import ConfigType
 
+from .codec import ENCODING_AUTO, ENCODING_JSON
 from .const import (
+    CONF_COMPRESS,
+    CONF_ENCODING,
+    CONF_HEDGE_AFTER,
     CONF_HOOK,
     CONF_HOST,
     DATA_CONF,
     DATA_COORDINATOR,
+    DATA_HEALTH,
+    DATA_INDEX,
+    DATA_PROFILER,
+    DATA_TIMINGS,
+    DATA_TIMINGS_STORE,
     DATA_WSLISTENER,
     DOMAIN,
     PLATFORMS,
+    SHUTDOWN_DRAIN_TIMEOUT,
+    TIMINGS_STORAGE_KEY,
+    TIMINGS_STORAGE_VERSION,
 )
 from .coordinator import MyStromCoordinator
+from .device_index import MyStromDeviceIndex
+from .fleet import async_get_fleet
+from .health import MyStromHealthMonitor
 from .MyStromAPIs import MyStromListener
+from .profiler import MyStromProfiler
+from .services import async_setup_services
+
+_LOGGER = logging.getLogger(__name__)
 
 CONFIG_SCHEMA = vol.Schema(
     {
         DOMAIN: vol.Schema({
             vol.Required(CONF_HOST): cv.string,
-            vol.Required(CONF_HOOK): cv.string
+            vol.Required(CONF_HOOK): cv.string,
+            vol.Optional(CONF_HEDGE_AFTER): vol.All(
+                vol.Coerce(float), vol.Range(min=0.05)
+            ),
+            vol.Optional(CONF_ENCODING, default=ENCODING_AUTO): vol.In(
+                [ENCODING_AUTO, ENCODING_JSON]
+            ),
+            vol.Optional(CONF_COMPRESS, default=True): cv.boolean,
         })
     }, extra=vol.ALLOW_EXTRA
 )
@@ -32,32 +62,82 @@ CONFIG_SCHEMA = vol.Schema(
 
 async def async_setup(hass: HomeAssistant, config: ConfigType):
     """Set up MyStrom Button Plus Integration."""
+    started = time.monotonic()
     conf = config[DOMAIN]
     hass.data.setdefault(DOMAIN, {})
     hass.data.setdefault(DATA_CONF, conf)
+    timings = hass.data[DATA_CONF][DATA_TIMINGS] = {"setup_started": started}
+
+    # The previous run's stop duration is only known from disk
+    timings_store = Store(hass, TIMINGS_STORAGE_VERSION, TIMINGS_STORAGE_KEY)
+    hass.data[DATA_CONF][DATA_TIMINGS_STORE] = timings_store
+    hass.async_create_background_task(
+        _async_load_timings(timings_store, timings), "MyStromTimings"
+    )
+
+    profiler = MyStromProfiler()
+    hass.data[DATA_CONF][DATA_PROFILER] = profiler
 
     websocket_listener = MyStromListener(
         conf[CONF_HOST],
         async_create_clientsession(hass, auto_cleanup=True),
         hass.loop,
+        profiler,
+        encoding=conf[CONF_ENCODING],
+        compress=conf[CONF_COMPRESS],
     )
-    websocket_listener.create_loop_task()
     hass.data[DATA_CONF][DATA_WSLISTENER] = websocket_listener
 
     data_coordinator = MyStromCoordinator(hass, websocket_listener)
     hass.data[DATA_CONF][DATA_COORDINATOR] = data_coordinator
+    websocket_listener.create_loop_task()
 
-    hass.bus.async_listen_once(
-        EVENT_HOMEASSISTANT_STOP, lambda _: cleanup(hass, config)
+    # Nothing in here may wait on the network or disk; the listener connects
+    # and the index loads in the background
+    device_index = MyStromDeviceIndex(hass)
+    hass.async_create_background_task(
+        device_index.async_start(), "MyStromDeviceIndex"
     )
+    hass.data[DATA_CONF][DATA_INDEX] = device_index
+
+    health_monitor = MyStromHealthMonitor(hass, lambda: async_get_fleet(hass))
+    health_monitor.start()
+    hass.data[DATA_CONF][DATA_HEALTH] = health_monitor
 
+    async_setup_services(hass)
+
+    async def _async_cleanup(event: Event):
+        await async_cleanup(hass)
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_cleanup)
+
+    timings["setup"] = time.monotonic() - started
     return True
 
 
-def cleanup(hass: HomeAssistant, config: ConfigType):
-    """Cleanup on Home Assistant shutdown."""
+async def async_cleanup(hass: HomeAssistant):
+    """Cleanup on Home Assistant shutdown, draining queued WebSocket frames."""
+    started = time.monotonic()
+    hass.data[DATA_CONF][DATA_HEALTH].kill()
+    hass.data[DATA_CONF][DATA_INDEX].kill()
+
     websocket_listener = hass.data[DATA_CONF][DATA_WSLISTENER]
-    websocket_listener.kill()
+    await websocket_listener.async_stop(SHUTDOWN_DRAIN_TIMEOUT)
+    hass.data[DATA_CONF][DATA_COORDINATOR].remove_callback()
+
+    timings = hass.data[DATA_CONF][DATA_TIMINGS]
+    timings["stop"] = time.monotonic() - started
+    _LOGGER.info("Stopped in %.3f seconds", timings["stop"])
+    await hass.data[DATA_CONF][DATA_TIMINGS_STORE].async_save(
+        {"last_stop": timings["stop"]}
+    )
+
+
+async def _async_load_timings(store: Store, timings: dict):
+    """Load timings persisted by the previous run."""
+    stored = await store.async_load()
+    if stored is not None:
+        timings["last_stop"] = stored.get("last_stop")
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
@@ -0,0 +1,73 @@
+"""Frame encodings spoken between the translator and MyStromListener.
+
+JSON frames are objects with the keys below. The binary encodings pack the
+same values into an array in FIELDS order, which is negotiated per
+connection through the WebSocket subprotocol. msgpack and cbor2 are
+optional; without them only JSON is offered.
+"""
+from __future__ import annotations
+
+import json
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:  # pragma: no cover
+    cbor2 = None
+
+FIELDS = ("mac", "index", "action", "bat", "temp", "rh")
+
+PROTOCOL_JSON = "mystrom.json"
+PROTOCOL_MSGPACK = "mystrom.msgpack"
+PROTOCOL_CBOR = "mystrom.cbor"
+
+ENCODING_AUTO = "auto"
+ENCODING_JSON = "json"
+
+
+def available_protocols(encoding: str = ENCODING_AUTO) -> tuple[str, ...]:
+    """Return the subprotocols we can speak, most compact first."""
+    if encoding == ENCODING_JSON:
+        return (PROTOCOL_JSON,)
+
+    protocols = []
+    if msgpack is not None:
+        protocols.append(PROTOCOL_MSGPACK)
+    if cbor2 is not None:
+        protocols.append(PROTOCOL_CBOR)
+    protocols.append(PROTOCOL_JSON)
+    return tuple(protocols)
+
+
+def encode(frame: dict, protocol: str | None) -> str | bytes:
+    """Encode a frame; JSON is returned as text, everything else as bytes."""
+    if protocol == PROTOCOL_MSGPACK:
+        return msgpack.packb([frame.get(field) for field in FIELDS])
+    if protocol == PROTOCOL_CBOR:
+        return cbor2.dumps([frame.get(field) for field in FIELDS])
+    return json.dumps(frame, separators=(",", ":"))
+
+
+def decode(data: str | bytes, protocol: str | None) -> dict:
+    """Decode a frame received on a connection using protocol.
+
+    Raises ValueError or TypeError on malformed frames.
+    """
+    if isinstance(data, bytes) and protocol == PROTOCOL_MSGPACK:
+        try:
+            return dict(zip(FIELDS, msgpack.unpackb(data)))
+        except msgpack.UnpackException as err:
+            raise ValueError(f"Malformed msgpack frame: {err}") from err
+    if isinstance(data, bytes) and protocol == PROTOCOL_CBOR:
+        try:
+            return dict(zip(FIELDS, cbor2.loads(data)))
+        except cbor2.CBORDecodeError as err:
+            raise ValueError(f"Malformed CBOR frame: {err}") from err
+
+    if isinstance(data, bytes):
+        data = data.decode()
+    return json.loads(data)
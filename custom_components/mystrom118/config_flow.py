@@ -8,8 +8,16 @@ import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.helpers.aiohttp_client import async_create_clientsession
 
-from .const import CONF_HOOK, CORE_DEVICE_NAME, DATA_CONF, DOMAIN
+from .const import (
+    CONF_HOOK,
+    CORE_DEVICE_NAME,
+    DATA_CONF,
+    DATA_INDEX,
+    DOMAIN,
+    VERIFY_TIMEOUT,
+)
 from .discovery import discover
+from .fleet import async_verify_candidates
 from .MyStromAPIs import MyStromAPI
 
 _LOGGER = logging.getLogger(__name__)
@@ -43,6 +51,16 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if info is not None:
             if "checkme" in info:
                 if info["checkme"]:
+                    # Devices announce themselves all the time, so the index
+                    # usually knows them already and we can skip sniffing.
+                    # Entries can still be stale, sniff if none of them answer.
+                    device_index = self.hass.data[DATA_CONF][DATA_INDEX]
+                    usable_devices = await self._async_usable_devices(
+                        device_index.async_recent(118)
+                    )
+                    if usable_devices:
+                        return await self.async_step_configure(usable_devices)
+
                     task = self.hass.async_create_task(
                         discover(self.hass, 11), f"{DOMAIN}_discovery"
                     )
@@ -51,12 +69,15 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                         devices = await task
                     except Exception:
                         return self.async_abort(reason="discovery_failed")
+
+                    for device in devices:
+                        device_index.async_update(device)
                     return await self.async_step_discovery(info=devices)
                 else:
                     return await self.async_step_discovery()
 
             elif isinstance(info, list):
-                usable_devices = [dev for dev in info if dev["device"] == 118]
+                usable_devices = await self._async_usable_devices(info)
 
                 if len(usable_devices) == 0:
                     return self.async_show_form(
@@ -67,10 +88,6 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                         },
                     )
 
-                session = async_create_clientsession(self.hass, False)
-                for count, value in enumerate(usable_devices):
-                    usable_devices[count]["api"] = MyStromAPI(value["ip"], session)
-
                 return await self.async_step_configure(usable_devices)
 
             else:
@@ -81,6 +98,21 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             data_schema=vol.Schema({vol.Required("checkme"): bool}),
         )
 
+    async def _async_usable_devices(self, devices: list[dict]) -> list[dict]:
+        """Return the unconfigured Button Plus devices that answer."""
+        configured = self._async_current_ids()
+        candidates = [
+            dev
+            for dev in devices
+            if dev["device"] == 118 and dev["mac"] not in configured
+        ]
+
+        # The broadcast can be stale or spoofed, make sure the devices are
+        # really there (one /info each, all at once)
+        return await async_verify_candidates(
+            async_create_clientsession(self.hass, False), candidates
+        )
+
     async def async_step_manual(self, info=None):
         """Manual Discovery."""
         if info is not None:
@@ -89,12 +121,11 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 api = MyStromAPI(
                     info["ip_address"], async_create_clientsession(self.hass, False)
                 )
-                is_online = await api.is_online()
-                if not is_online:
+                try:
+                    info = await api.deviceInfo(VERIFY_TIMEOUT)
+                except Exception:
                     return self.async_abort(reason="no_devices_found")
 
-                info = await api.deviceInfo()
-
                 if info["type"] != 118:
                     return self.async_abort(reason="no_devices_found")
 
@@ -115,6 +146,33 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             ),
         )
 
+    async def async_step_integration_discovery(self, discovery_info):
+        """Button showed up on the event stream without being configured."""
+        mac = discovery_info["mac"]
+        await self.async_set_unique_id(mac)
+        self._abort_if_unique_id_configured()
+
+        # It already talks to our webhook, we only need its address for the
+        # HTTP API; the device index fills it in later if it isn't known yet
+        device = self.hass.data[DATA_CONF][DATA_INDEX].devices.get(mac)
+        self.discovered = {"mac": mac, "ip": device["ip"] if device else None}
+        self.context["title_placeholders"] = {"mac": mac}
+
+        return await self.async_step_confirm()
+
+    async def async_step_confirm(self, info=None):
+        """Confirm setup of a button found on the event stream."""
+        if info is not None:
+            return self.async_create_entry(
+                title=CORE_DEVICE_NAME.format(mac=self.discovered["mac"]),
+                data=self.discovered,
+            )
+
+        return self.async_show_form(
+            step_id="confirm",
+            description_placeholders={"mac": self.discovered["mac"]},
+        )
+
     async def async_step_configure(self, info):
         """Configure MyStrom Button Plus entries."""
         if not isinstance(info, list) or len(info) == 0:
@@ -9,10 +9,62 @@ CORE_DEVICE_PRODUCT = "MyStrom Button Plus"
 CONF_HOST = "websocket_url"
 CONF_HOOK = "webhook_url"
 CONF_MAC = "mac_address"
+CONF_HEDGE_AFTER = "hedge_after"
+CONF_ENCODING = "encoding"
+CONF_COMPRESS = "compress"
 
 DATA_CONF = "mystrom118_conf"
 DATA_WSLISTENER = "WS"
 DATA_COORDINATOR = "COORDINATOR"
+DATA_SESSION = "SESSION"
+DATA_APIS = "APIS"
+DATA_HEALTH = "HEALTH"
+DATA_INDEX = "INDEX"
+DATA_PROFILER = "PROFILER"
+DATA_TIMINGS = "TIMINGS"
+DATA_TIMINGS_STORE = "TIMINGS_STORE"
+
+SHUTDOWN_DRAIN_TIMEOUT = 5
+TIMINGS_STORAGE_KEY = f"{DOMAIN}.timings"
+TIMINGS_STORAGE_VERSION = 1
+
+SERVICE_SURVEY_WIFI = "survey_wifi"
+SERVICE_HEALTH_REPORT = "health_report"
+SERVICE_ROLLOUT_SETTINGS = "rollout_settings"
+SERVICE_PROFILE_START = "profile_start"
+SERVICE_PROFILE_STOP = "profile_stop"
+SERVICE_CONFIGURE_ALERTS = "configure_alerts"
+
+ATTR_DEVICES = "devices"
+ATTR_LIMIT = "limit"
+ATTR_TIMEOUT = "timeout"
+ATTR_SETTINGS = "settings"
+ATTR_CANARY = "canary"
+ATTR_RETRIES = "retries"
+ATTR_DRY_RUN = "dry_run"
+ATTR_SLOW_THRESHOLD = "slow_threshold"
+
+DEFAULT_FLEET_LIMIT = 50
+DEFAULT_SCAN_TIMEOUT = 15
+DEFAULT_ROLLOUT_TIMEOUT = 30
+DEFAULT_ROLLOUT_CANARY = 1
+DEFAULT_ROLLOUT_RETRIES = 3
+ROLLOUT_BACKOFF = 1
+VERIFY_TIMEOUT = 3
+
+DISCOVERY_PORT = 7979
+INDEX_SAVE_DELAY = 60
+# Devices broadcast every few seconds, anything quieter may have moved away
+INDEX_FRESH = 60
+
+HEALTH_TICK = 1
+HEALTH_PROBE_LIMIT = 50
+HEALTH_PROBE_TIMEOUT = 2
+HEALTH_MIN_INTERVAL = 10
+HEALTH_MAX_INTERVAL = 300
+HEALTH_BREAKER_THRESHOLD = 3
+HEALTH_BREAKER_BASE = 60
+HEALTH_BREAKER_MAX = 3600
 
 COMPONENT_LOOKUP = {
     "0": "GENERIC",
@@ -33,3 +85,10 @@ ACTION_LOOKUP = {
     "28": "OVER_VALUE",
     "29": "UNDER_VALUE",
 }
+
+# Actions the device evaluates itself; GENERIC matches any component
+ALERT_ACTIONS = {
+    "TEMPERATURE": ["OVER_VALUE", "UNDER_VALUE"],
+    "HUMIDITY": ["OVER_VALUE", "UNDER_VALUE"],
+    "GENERIC": ["BATTERY"],
+}
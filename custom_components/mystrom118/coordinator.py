@@ -5,10 +5,11 @@ from __future__ import annotations
 from json import loads
 import logging
 
-from homeassistant.core import HomeAssistant
+from homeassistant.config_entries import SOURCE_INTEGRATION_DISCOVERY
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
-from .const import ACTION_LOOKUP, COMPONENT_LOOKUP
+from .const import ACTION_LOOKUP, COMPONENT_LOOKUP, DOMAIN
 from .MyStromAPIs import MyStromListener
 
 _LOGGER = logging.getLogger(__name__)
@@ -25,19 +26,28 @@ class MyStromCoordinator(DataUpdateCoordinator):
             # Name of the data. For logging purposes.
             name="MyStrom Data Coordinator",
         )
-        ws_listener.callbacks.append(self._async_update_data)
+        self.profiler = ws_listener.profiler
+        self.known_macs: set[str] = set()
+        self.remove_callback = ws_listener.add_callback(self._async_update_data)
 
-    async def _async_update_data(self, data: bytes | str):
+    async def _async_update_data(self, data: dict | bytes | str):
         """Function's called once WebSocket Data received."""
         # yes this is the only way I managed to make it not shout at me
 
         if isinstance(data, bytes):
             data = data.decode()
 
-        data = loads(data)
+        if isinstance(data, str):
+            data = loads(data)
 
-        component = COMPONENT_LOOKUP[data["index"]]
-        action = ACTION_LOOKUP[data["action"]]
+        # Binary frames carry index and action as numbers
+        component = COMPONENT_LOOKUP[str(data["index"])]
+        action = ACTION_LOOKUP[str(data["action"])]
+
+        # YAML platforms may still be setting up their entities while
+        # Home Assistant starts; decide once it's running
+        if data["mac"] not in self.known_macs and self.hass.is_running:
+            self._async_enrol(data["mac"])
 
         data = {
             "mac": data["mac"],
@@ -49,3 +59,28 @@ class MyStromCoordinator(DataUpdateCoordinator):
         }
 
         self.async_set_updated_data(data)
+
+    @callback
+    def _async_enrol(self, mac: str):
+        """Offer a button we got a frame from but don't know as discovered."""
+        self.known_macs.add(mac)
+
+        configured = {
+            entry.unique_id for entry in self.hass.config_entries.async_entries(DOMAIN)
+        }
+        # Buttons set up through YAML only show up as entities, from either
+        # platform; any of their unique_ids marks the button as known
+        prefix = f"mystrom_button_plus_{mac}_"
+        if mac in configured or any(
+            key.startswith(prefix) for key in self.hass.data[DOMAIN]
+        ):
+            return
+
+        _LOGGER.info("Frame from unknown button %s, offering it for setup", mac)
+        self.hass.async_create_task(
+            self.hass.config_entries.flow.async_init(
+                DOMAIN,
+                context={"source": SOURCE_INTEGRATION_DISCOVERY},
+                data={"mac": mac},
+            )
+        )
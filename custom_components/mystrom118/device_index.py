@@ -0,0 +1,100 @@
+"""Persistent MAC to IP index of MyStrom devices seen on the network."""
+from __future__ import annotations
+
+import logging
+import time
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DATA_APIS, DATA_CONF, DOMAIN, INDEX_FRESH, INDEX_SAVE_DELAY
+from .discovery import listen
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_KEY = f"{DOMAIN}.devices"
+STORAGE_VERSION = 1
+
+
+class MyStromDeviceIndex:
+    """Keeps track of where every device was last seen."""
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize MyStromDeviceIndex."""
+        self.hass = hass
+        self.store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self.devices: dict[str, dict] = {}
+        self.transport = None
+        self.stopped = False
+        self._save_pending = False
+
+    async def async_start(self):
+        """Load the index from disk and start listening for broadcasts."""
+        self.devices = await self.store.async_load() or {}
+        if not self.stopped:
+            self.transport = await listen(self.hass, self.async_update)
+
+    def kill(self):
+        """Stop listening for broadcasts."""
+        self.stopped = True
+        if self.transport is not None:
+            self.transport.close()
+
+    @callback
+    def async_recent(self, device_type: int | None = None) -> list[dict]:
+        """Return devices seen recently, optionally only of one type."""
+        cutoff = time.time() - INDEX_FRESH
+        return [
+            {"mac": mac, **{k: v for k, v in data.items() if k != "last_seen"}}
+            for mac, data in self.devices.items()
+            if data["last_seen"] >= cutoff
+            and (device_type is None or data["device"] == device_type)
+        ]
+
+    @callback
+    def async_update(self, device: dict):
+        """Record a discovery broadcast."""
+        mac = device["mac"]
+        known = self.devices.get(mac)
+
+        self.devices[mac] = {
+            "ip": device["ip"],
+            "device": device["device"],
+            "status": device["status"],
+            "last_seen": time.time(),
+        }
+
+        if known is None or known["ip"] == device["ip"]:
+            # A new device or only last_seen changed, no hurry to write that
+            # down; a first run can see hundreds of devices at once.
+            # Scheduling again would push the pending write back on every
+            # broadcast.
+            if not self._save_pending:
+                self._save_pending = True
+                self.store.async_delay_save(self._data_to_save, INDEX_SAVE_DELAY)
+            return
+
+        # An address change is written right away; this replaces any
+        # pending delayed write, as it saves the same data
+        self._save_pending = False
+        self.hass.async_create_task(self.store.async_save(self.devices))
+        self._async_repoint(mac, device["ip"])
+
+    def _data_to_save(self) -> dict[str, dict]:
+        """Return the data for a delayed write."""
+        self._save_pending = False
+        return self.devices
+
+    @callback
+    def _async_repoint(self, mac: str, ip: str):
+        """Re-point config entry and cached API if the address changed."""
+        for entry in self.hass.config_entries.async_entries(DOMAIN):
+            if entry.data["mac"] == mac and entry.data.get("ip") != ip:
+                _LOGGER.info("%s moved to %s", mac, ip)
+                self.hass.config_entries.async_update_entry(
+                    entry, data={**entry.data, "ip": ip}
+                )
+
+        api = self.hass.data[DATA_CONF].get(DATA_APIS, {}).get(mac)
+        if api is not None and api.host != ip:
+            api.set_host(ip)
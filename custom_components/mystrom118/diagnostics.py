@@ -0,0 +1,37 @@
+"""Diagnostics support for MyStrom Button Plus."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DATA_CONF, DATA_HEALTH, DATA_TIMINGS, DATA_WSLISTENER
+from .fleet import async_get_fleet
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    mac = entry.data["mac"]
+    api = async_get_fleet(hass, [mac]).get(mac)
+    health = hass.data[DATA_CONF][DATA_HEALTH].devices.get(mac)
+    listener = hass.data[DATA_CONF][DATA_WSLISTENER]
+    timings = hass.data[DATA_CONF][DATA_TIMINGS]
+
+    return {
+        "entry": dict(entry.data),
+        "requests": {}
+        if api is None
+        else {endpoint: stats.as_dict() for endpoint, stats in api.stats.items()},
+        "health": None if health is None else health.as_dict(),
+        "listener": listener.as_dict(),
+        "timings": {
+            "setup": timings.get("setup"),
+            "last_stop": timings.get("last_stop"),
+            "ready": None
+            if listener.first_connect is None
+            else listener.first_connect - timings["setup_started"],
+        },
+    }
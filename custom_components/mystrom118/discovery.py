@@ -2,19 +2,25 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Callable
+import logging
 
 from scapy.all import AsyncSniffer
 
 from homeassistant.components import network
 from homeassistant.core import HomeAssistant
 
+from .const import DISCOVERY_PORT
 
-def parse_status(status):
+_LOGGER = logging.getLogger(__name__)
+
+
+def parse_status(status: int):
     """Parse MyStrom Status Byte."""
     return {
-        "cloud_connected": bool(int(status[0])),
-        "registered": bool(int(status[1])),
-        "mesh_child": bool(int(status[2])),
+        "cloud_connected": bool(status & 0b100),
+        "registered": bool(status & 0b010),
+        "mesh_child": bool(status & 0b001),
     }
 
 
@@ -25,13 +31,58 @@ async def dissect(packet):
     mac = "".join(packet[0].src.split(":"))  # Get MAC from Ethernet Layer
     ip = packet[1].src  # Get IPv4 from IP Layer
 
+    return parse_announcement(raw, mac, ip)
+
+
+def parse_announcement(raw: bytes, mac: str, ip: str):
+    """Parse Discovery Payload."""
     device = raw[6]  # Get Device Type from Payload
-    status = bin(raw[-1])[2:]  # Get Status Byte from Payload
-    status = parse_status(status)  # Parse Status Byte
+    status = parse_status(raw[-1])  # Parse Status Byte from Payload
 
     return {"mac": mac.upper(), "ip": ip, "device": device, "status": status}
 
 
+class MyStromDiscoveryProtocol(asyncio.DatagramProtocol):
+    """Receives the discovery broadcasts devices send every few seconds."""
+
+    def __init__(self, on_device: Callable[[dict], None]):
+        """Initialize MyStromDiscoveryProtocol."""
+        self.on_device = on_device
+
+    def datagram_received(self, data: bytes, addr):
+        """Parse broadcast and pass it on."""
+        if len(data) < 8:
+            return
+
+        try:
+            device = parse_announcement(data, data[:6].hex(), addr[0])
+        except (IndexError, ValueError):
+            _LOGGER.debug("Ignoring malformed discovery packet from %s", addr[0])
+            return
+
+        self.on_device(device)
+
+
+async def listen(hass: HomeAssistant, on_device: Callable[[dict], None]):
+    """Listen for discovery broadcasts without sniffing; returns the transport."""
+    try:
+        transport, _ = await hass.loop.create_datagram_endpoint(
+            lambda: MyStromDiscoveryProtocol(on_device),
+            local_addr=("0.0.0.0", DISCOVERY_PORT),
+            reuse_port=True,
+            allow_broadcast=True,
+        )
+    except OSError:
+        _LOGGER.warning(
+            "Could not listen on UDP port %s, device addresses will not be tracked",
+            DISCOVERY_PORT,
+            exc_info=True,
+        )
+        return None
+
+    return transport
+
+
 async def discover(hass: HomeAssistant, timeout: int):
     """Discover MyStrom118 Devices."""
 
@@ -23,6 +23,7 @@ from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
+    ALERT_ACTIONS,
     CORE_DEVICE_MANUFACTURER,
     CORE_DEVICE_NAME,
     CORE_DEVICE_PRODUCT,
@@ -31,6 +32,7 @@ from .const import (
     DOMAIN,
 )
 from .coordinator import MyStromCoordinator
+from .profiler import profiled
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -57,6 +59,13 @@ async def async_setup_entry(
         )
         entities.append(entity)
 
+    for component in ALERT_ACTIONS:
+        entities.append(
+            MyStromAlertEntity(
+                hass.data[DATA_CONF][DATA_COORDINATOR], data["mac"], component
+            )
+        )
+
     for entity in entities:
         hass.data[DOMAIN][entity.unique_id] = entity
 
@@ -79,6 +88,11 @@ async def async_setup_platform(
         )
         entities.append(device)
 
+    for component in ALERT_ACTIONS:
+        entities.append(
+            MyStromAlertEntity(hass.data[DATA_CONF][DATA_COORDINATOR], mac, component)
+        )
+
     for entity in entities:
         hass.data[DOMAIN][entity.unique_id] = entity
 
@@ -108,6 +122,7 @@ class MyStromButtonEntity(CoordinatorEntity, EventEntity):
         self.unique_id = self._attr_unique_id
 
     @callback
+    @profiled
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
 
@@ -143,3 +158,70 @@ class MyStromButtonEntity(CoordinatorEntity, EventEntity):
     def device_class(self):
         """Return device_class."""
         return EventDeviceClass.BUTTON
+
+
+class MyStromAlertEntity(CoordinatorEntity, EventEntity):
+    """Threshold and battery alerts evaluated on the device itself."""
+
+    NAMES = {
+        "TEMPERATURE": ("Temperature Alert", "mdi:thermometer-alert"),
+        "HUMIDITY": ("Humidity Alert", "mdi:water-alert"),
+        "GENERIC": ("Battery Alert", "mdi:battery-alert"),
+    }
+
+    def __init__(self, coordinator: MyStromCoordinator, macaddr, component):
+        """Pass coordinator to CoordinatorEntity."""
+        super().__init__(coordinator, context=macaddr)
+
+        self.coordinator = coordinator
+
+        self.mac = macaddr
+        self.component = component
+        self.device_name = CORE_DEVICE_NAME.format(mac=macaddr)
+
+        self._name, self._icon = self.NAMES[component]
+        self._attr_event_types = ALERT_ACTIONS[component]
+
+        self._attr_unique_id = (
+            f"mystrom_button_plus_{macaddr}_{component.lower()}_alert"
+        )
+        self.unique_id = self._attr_unique_id
+
+    @callback
+    @profiled
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+
+        data = self.coordinator.data
+        if data["mac"] != self.mac or data["action"] not in self.event_types:
+            return
+        if self.component != "GENERIC" and data["component"] != self.component:
+            return
+
+        attributes = {
+            "temperature": data["temperature"],
+            "humidity": data["humidity"],
+            "battery": data["battery"],
+        }
+        self._trigger_event(data["action"], attributes)
+        self.async_write_ha_state()
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return the device info."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, self.mac)},
+            name=self.device_name,
+            manufacturer=CORE_DEVICE_MANUFACTURER,
+            model=CORE_DEVICE_PRODUCT,
+        )
+
+    @property
+    def name(self):
+        """Return name."""
+        return self._name
+
+    @property
+    def icon(self):
+        """Return icon."""
+        return self._icon
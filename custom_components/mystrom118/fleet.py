@@ -0,0 +1,288 @@
+"""Fleet-wide operations across all configured MyStrom Button Plus devices."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import logging
+import time
+from typing import Any
+
+from aiohttp import ClientSession
+from requests import Request
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+
+from .const import (
+    ALERT_ACTIONS,
+    CONF_HEDGE_AFTER,
+    DATA_APIS,
+    DATA_CONF,
+    DATA_SESSION,
+    DEFAULT_FLEET_LIMIT,
+    DOMAIN,
+    ROLLOUT_BACKOFF,
+    VERIFY_TIMEOUT,
+)
+from .MyStromAPIs import MyStromAPI
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def normalize_mac(mac: str) -> str:
+    """Bring a MAC address into the format stored in config entries."""
+    return mac.replace(":", "").replace("-", "").upper()
+
+
+@callback
+def async_get_fleet(
+    hass: HomeAssistant, macs: list[str] | None = None
+) -> dict[str, MyStromAPI]:
+    """Return cached APIs of configured devices, keyed by MAC."""
+    conf = hass.data[DATA_CONF]
+    if DATA_SESSION not in conf:
+        conf[DATA_SESSION] = async_create_clientsession(hass, False)
+    apis: dict[str, MyStromAPI] = conf.setdefault(DATA_APIS, {})
+
+    wanted = {normalize_mac(mac) for mac in macs} if macs else None
+
+    fleet = {}
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        mac = entry.data["mac"]
+        ip = entry.data.get("ip")
+        if not ip or (wanted is not None and mac not in wanted):
+            continue
+
+        api = apis.get(mac)
+        if api is None:
+            api = apis[mac] = MyStromAPI(
+                ip, conf[DATA_SESSION], hedge_after=conf.get(CONF_HEDGE_AFTER)
+            )
+        elif api.host != ip:
+            api.set_host(ip)
+
+        fleet[mac] = api
+
+    return fleet
+
+
+async def async_run_bounded(
+    fleet: dict[str, MyStromAPI],
+    func: Callable[[MyStromAPI], Awaitable[Any]],
+    limit: int,
+    timeout: float,
+) -> tuple[dict[str, Any], dict[str, str]]:
+    """Run func for every device with at most limit calls in flight.
+
+    The timeout applies per device and only starts once the device got a slot,
+    so queued devices are not punished for waiting.
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def _run(mac: str, api: MyStromAPI):
+        async with semaphore:
+            try:
+                return mac, await asyncio.wait_for(func(api), timeout), None
+            except asyncio.TimeoutError:
+                return mac, None, "timeout"
+            except Exception as err:  # pylint: disable=broad-except
+                return mac, None, str(err) or type(err).__name__
+
+    results = await asyncio.gather(*(_run(mac, api) for mac, api in fleet.items()))
+
+    succeeded = {mac: res for mac, res, err in results if err is None}
+    failed = {mac: err for mac, _, err in results if err is not None}
+    return succeeded, failed
+
+
+async def async_verify_candidates(
+    session: ClientSession,
+    candidates: list[dict],
+    limit: int = DEFAULT_FLEET_LIMIT,
+    timeout: float = VERIFY_TIMEOUT,
+) -> list[dict]:
+    """Ask every discovery candidate for /info at once, keep real Button Pluses.
+
+    Verified candidates get their firmware version, the address the device
+    reports and a ready to use MyStromAPI attached.
+    """
+    apis = {
+        dev["mac"]: MyStromAPI(dev["ip"], session, retries=0) for dev in candidates
+    }
+
+    infos, failed = await async_run_bounded(
+        apis, lambda api: api.deviceInfo(timeout), limit, timeout
+    )
+    for mac, reason in failed.items():
+        _LOGGER.debug("Discovered device %s did not answer: %s", mac, reason)
+
+    verified = []
+    for dev in candidates:
+        info = infos.get(dev["mac"])
+        if info is None or info.get("type") != 118:
+            continue
+
+        verified.append(
+            {
+                **dev,
+                "ip": info.get("ip") or dev["ip"],
+                "firmware": info.get("version"),
+                "api": apis[dev["mac"]],
+            }
+        )
+
+    return verified
+
+
+async def async_survey_wifi(
+    fleet: dict[str, MyStromAPI], limit: int, timeout: float
+) -> dict[str, Any]:
+    """Scan for access points on all devices and build an SSID x device matrix."""
+    started = time.monotonic()
+
+    scans, failed = await async_run_bounded(
+        fleet, lambda api: api.getAPsInRange(timeout), limit, timeout
+    )
+
+    matrix: dict[str, dict[str, int]] = {}
+    for mac, aps in scans.items():
+        for ap in aps:
+            row = matrix.setdefault(ap["ssid"], {})
+            # An SSID may be served by several APs, only keep the strongest one
+            if mac not in row or ap["strength"] > row[mac]:
+                row[mac] = ap["strength"]
+
+    for mac, reason in failed.items():
+        _LOGGER.warning("Wi-Fi scan on %s failed: %s", mac, reason)
+
+    return {
+        "devices": sorted(scans),
+        "failed": failed,
+        "ssids": matrix,
+        "duration": round(time.monotonic() - started, 3),
+    }
+
+
+async def _async_apply_settings(
+    api: MyStromAPI, target: dict[str, Any], retries: int, dry_run: bool
+) -> dict[str, Any]:
+    """Push the settings that differ from target to a single device."""
+    current = await api.getSettings()
+    changes = {key: val for key, val in target.items() if current.get(key) != val}
+
+    if not changes or dry_run:
+        return changes
+
+    for attempt in range(retries + 1):
+        try:
+            await api.setSetting(changes)
+            break
+        except Exception:  # pylint: disable=broad-except
+            if attempt == retries:
+                raise
+            await asyncio.sleep(ROLLOUT_BACKOFF * 2**attempt)
+
+    return changes
+
+
+async def async_rollout_settings(
+    fleet: dict[str, MyStromAPI],
+    target: dict[str, Any],
+    canary: int,
+    limit: int,
+    timeout: float,
+    retries: int,
+    dry_run: bool = False,
+) -> dict[str, Any]:
+    """Roll target settings out to all devices, canaries first.
+
+    The first canary devices (by MAC) are updated on their own; if any of
+    them fails the rollout stops and the remaining devices are left alone.
+    """
+    started = time.monotonic()
+    macs = sorted(fleet)
+    stages = [macs[:canary], macs[canary:]]
+
+    report: dict[str, Any] = {
+        "canary": stages[0],
+        "dry_run": dry_run,
+        "changes": {},
+        "updated": [],
+        "unchanged": [],
+        "failed": {},
+        "skipped": [],
+        "aborted": False,
+    }
+
+    for number, stage in enumerate(stages, start=1):
+        if not stage:
+            continue
+
+        if report["failed"]:
+            report["aborted"] = True
+            report["skipped"] = stage
+            _LOGGER.warning(
+                "Settings rollout aborted, canaries failed: %s", report["failed"]
+            )
+            break
+
+        changes, failed = await async_run_bounded(
+            {mac: fleet[mac] for mac in stage},
+            lambda api: _async_apply_settings(api, target, retries, dry_run),
+            limit,
+            timeout,
+        )
+
+        report["failed"].update(failed)
+        for mac, changed in changes.items():
+            if changed:
+                report["changes"][mac] = changed
+                report["updated"].append(mac)
+            else:
+                report["unchanged"].append(mac)
+
+        _LOGGER.info(
+            "Settings rollout stage %s/%s: %s updated, %s unchanged, %s failed",
+            number,
+            len(stages),
+            sum(1 for mac in stage if mac in report["changes"]),
+            sum(1 for mac in stage if mac in changes and not changes[mac]),
+            len(failed),
+        )
+
+    report["updated"].sort()
+    report["unchanged"].sort()
+    report["duration"] = round(time.monotonic() - started, 3)
+    return report
+
+
+async def _async_configure_alerts(
+    api: MyStromAPI, url: str, settings: dict[str, Any] | None
+):
+    """Route a device's threshold and battery actions to the webhook."""
+    if settings:
+        await api.setSetting(settings)
+
+    for component, actions in ALERT_ACTIONS.items():
+        for action in actions:
+            await api.setSpecificAction(
+                component.lower(), action.lower(), Request(method="POST", url=url)
+            )
+
+
+async def async_configure_alerts(
+    fleet: dict[str, MyStromAPI],
+    url: str,
+    settings: dict[str, Any] | None,
+    limit: int,
+    timeout: float,
+) -> dict[str, Any]:
+    """Let all devices evaluate thresholds themselves and push the alerts."""
+    configured, failed = await async_run_bounded(
+        fleet, lambda api: _async_configure_alerts(api, url, settings), limit, timeout
+    )
+
+    for mac, reason in failed.items():
+        _LOGGER.warning("Configuring alerts on %s failed: %s", mac, reason)
+
+    return {"configured": sorted(configured), "failed": failed}
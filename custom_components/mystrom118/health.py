@@ -0,0 +1,150 @@
+"""Background health checks for MyStrom Button Plus devices."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import logging
+import time
+
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    HEALTH_BREAKER_BASE,
+    HEALTH_BREAKER_MAX,
+    HEALTH_BREAKER_THRESHOLD,
+    HEALTH_MAX_INTERVAL,
+    HEALTH_MIN_INTERVAL,
+    HEALTH_PROBE_LIMIT,
+    HEALTH_PROBE_TIMEOUT,
+    HEALTH_TICK,
+)
+from .MyStromAPIs import MyStromAPI
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class DeviceHealth:
+    """Health state and circuit breaker of a single device."""
+
+    def __init__(self):
+        """Initialize DeviceHealth."""
+        self.online = None
+        self.failures = 0
+        self.trips = 0
+        self.interval = HEALTH_MIN_INTERVAL
+        self.next_probe = 0.0
+        self.breaker_open_until = 0.0
+        self.latency = None
+        self.last_seen = None
+
+    @property
+    def breaker_open(self) -> bool:
+        """Return whether probes are currently suspended."""
+        return self.breaker_open_until > time.monotonic()
+
+    def record_success(self, now: float, latency: float):
+        """Device answered; back off the probe interval."""
+        self.online = True
+        self.failures = 0
+        self.trips = 0
+        self.breaker_open_until = 0.0
+        self.latency = latency
+        self.last_seen = time.time()
+        self.interval = min(self.interval * 2, HEALTH_MAX_INTERVAL)
+        self.next_probe = now + self.interval
+
+    def record_failure(self, now: float):
+        """Device did not answer; re-check soon or trip the breaker."""
+        self.online = False
+        self.failures += 1
+        self.interval = HEALTH_MIN_INTERVAL
+
+        if self.failures < HEALTH_BREAKER_THRESHOLD:
+            self.next_probe = now + self.interval
+            return
+
+        backoff = min(HEALTH_BREAKER_BASE * 2**self.trips, HEALTH_BREAKER_MAX)
+        self.trips += 1
+        self.breaker_open_until = self.next_probe = now + backoff
+
+    def as_dict(self) -> dict:
+        """Return a serializable representation."""
+        return {
+            "online": self.online,
+            "failures": self.failures,
+            "breaker_open": self.breaker_open,
+            "breaker_trips": self.trips,
+            "interval": self.interval,
+            "latency": None if self.latency is None else round(self.latency, 4),
+            "last_seen": self.last_seen,
+        }
+
+
+class MyStromHealthMonitor:
+    """Probes all devices concurrently on adaptive per-device intervals."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        get_fleet: Callable[[], dict[str, MyStromAPI]],
+    ):
+        """Initialize MyStromHealthMonitor."""
+        self.hass = hass
+        self.get_fleet = get_fleet
+        self.devices: dict[str, DeviceHealth] = {}
+        self.task = None
+        self._semaphore = asyncio.Semaphore(HEALTH_PROBE_LIMIT)
+
+    def start(self):
+        """Start probing in the background."""
+        self.task = self.hass.async_create_background_task(
+            self._run(), "MyStromHealthMonitor"
+        )
+
+    def kill(self):
+        """Stop probing."""
+        if self.task is not None:
+            self.task.cancel()
+
+    async def _run(self):
+        """Probe every device that is due, once per tick."""
+        while True:
+            fleet = self.get_fleet()
+
+            for mac in self.devices.keys() - fleet.keys():
+                del self.devices[mac]
+
+            now = time.monotonic()
+            due = [
+                (mac, api)
+                for mac, api in fleet.items()
+                if self.devices.setdefault(mac, DeviceHealth()).next_probe <= now
+            ]
+            if due:
+                await asyncio.gather(*(self._probe(mac, api) for mac, api in due))
+
+            await asyncio.sleep(HEALTH_TICK)
+
+    async def _probe(self, mac: str, api: MyStromAPI):
+        """Probe a single device and update its state."""
+        state = self.devices[mac]
+
+        async with self._semaphore:
+            started = time.monotonic()
+            reachable = await api.probe(HEALTH_PROBE_TIMEOUT)
+            now = time.monotonic()
+
+        if reachable:
+            if state.online is False:
+                _LOGGER.info("%s is reachable again", mac)
+            state.record_success(now, now - started)
+            return
+
+        state.record_failure(now)
+        if state.breaker_open:
+            _LOGGER.warning(
+                "%s failed %s health checks, pausing checks for %.0f seconds",
+                mac,
+                state.failures,
+                state.breaker_open_until - now,
+            )
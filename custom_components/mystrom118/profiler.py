@@ -0,0 +1,149 @@
+"""Opt-in event loop profiling for MyStrom Button Plus Integration."""
+from __future__ import annotations
+
+import cProfile
+from contextlib import contextmanager
+from functools import wraps
+import logging
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+SLOW_CALLBACK_THRESHOLD = 0.05
+
+
+class StageStats:
+    """Wall and CPU time spent in a single stage.
+
+    Stages that await only have wall time, which includes the time spent
+    waiting and running other tasks.
+    """
+
+    def __init__(self, awaits: bool = False):
+        """Initialize StageStats."""
+        self.awaits = awaits
+        self.calls = 0
+        self.slow = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.max_wall = 0.0
+
+    def as_dict(self) -> dict:
+        """Return a serializable representation."""
+        return {
+            "calls": self.calls,
+            "slow": self.slow,
+            "wall": round(self.wall, 6),
+            "cpu": None if self.awaits else round(self.cpu, 6),
+            "max_wall": round(self.max_wall, 6),
+            "includes_awaits": self.awaits,
+        }
+
+
+class MyStromProfiler:
+    """Records per-stage timings while enabled.
+
+    Instrumented code checks enabled before doing anything else, so a
+    disabled profiler costs a single attribute lookup per call.
+    """
+
+    def __init__(self):
+        """Initialize MyStromProfiler."""
+        self.enabled = False
+        self.slow_threshold = SLOW_CALLBACK_THRESHOLD
+        self.stages: dict[str, StageStats] = {}
+        self.profile = None
+
+    def start(self, slow_threshold: float = SLOW_CALLBACK_THRESHOLD):
+        """Reset statistics and start recording on the calling thread.
+
+        A profile that is still running is stopped and discarded first, only
+        one profiler can be active per thread.
+        """
+        self.stop()
+        self.slow_threshold = slow_threshold
+        self.stages = {}
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+        self.enabled = True
+
+    def stop(self) -> cProfile.Profile | None:
+        """Stop recording and return the collected profile."""
+        self.enabled = False
+        profile, self.profile = self.profile, None
+        if profile is not None:
+            profile.disable()
+        return profile
+
+    def record(self, stage: str, wall: float, cpu: float | None, warn: bool = True):
+        """Add a measurement to a stage; cpu is None for stages that await."""
+        stats = self.stages.get(stage)
+        if stats is None:
+            stats = self.stages[stage] = StageStats(awaits=cpu is None)
+
+        stats.calls += 1
+        stats.wall += wall
+        if cpu is not None:
+            stats.cpu += cpu
+        stats.max_wall = max(stats.max_wall, wall)
+
+        if wall <= self.slow_threshold:
+            return
+
+        stats.slow += 1
+        if not warn:
+            return
+        if cpu is None:
+            _LOGGER.warning(
+                "%s took %.1f ms including awaits, above the %.1f ms threshold",
+                stage,
+                wall * 1000,
+                self.slow_threshold * 1000,
+            )
+        else:
+            _LOGGER.warning(
+                "%s took %.1f ms (%.1f ms CPU), above the %.1f ms threshold",
+                stage,
+                wall * 1000,
+                cpu * 1000,
+                self.slow_threshold * 1000,
+            )
+
+    @contextmanager
+    def measure(self, stage: str, awaits: bool = False, warn: bool = True):
+        """Measure the wrapped block.
+
+        The event loop runs every task on one thread, so CPU time of a block
+        that awaits would include other tasks; with awaits only its wall time
+        is kept. warn=False counts slow calls without logging them, for
+        stages whose inner stages already warn.
+        """
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            self.record(
+                stage,
+                time.perf_counter() - wall,
+                None if awaits else time.thread_time() - cpu,
+                warn,
+            )
+
+    def as_dict(self) -> dict:
+        """Return statistics of all stages."""
+        return {stage: stats.as_dict() for stage, stats in self.stages.items()}
+
+
+def profiled(func):
+    """Measure an entity's coordinator update handler while profiling."""
+
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        profiler = self.coordinator.profiler
+        if not profiler.enabled:
+            return func(self, *args, **kwargs)
+
+        with profiler.measure(f"entity.{type(self).__name__}"):
+            return func(self, *args, **kwargs)
+
+    return wrapper
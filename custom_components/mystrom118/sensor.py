@@ -33,6 +33,7 @@ from .const import (
     DOMAIN,
 )
 from .coordinator import MyStromCoordinator
+from .profiler import profiled
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -141,6 +142,7 @@ class MyStromTemperatureEntity(CoordinatorEntity, SensorEntity):
         return SensorStateClass.MEASUREMENT
 
     @callback
+    @profiled
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
 
@@ -206,6 +208,7 @@ class MyStromHumidityEntity(CoordinatorEntity, SensorEntity):
         return SensorStateClass.MEASUREMENT
 
     @callback
+    @profiled
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
 
@@ -271,6 +274,7 @@ class MyStromBatteryVoltageEntity(CoordinatorEntity, SensorEntity):
         return SensorStateClass.MEASUREMENT
 
     @callback
+    @profiled
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
 
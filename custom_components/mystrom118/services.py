@@ -0,0 +1,212 @@
+"""Services for MyStrom Button Plus Integration."""
+from __future__ import annotations
+
+import json
+import time
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+import homeassistant.helpers.config_validation as cv
+
+from .const import (
+    ATTR_CANARY,
+    ATTR_DEVICES,
+    ATTR_DRY_RUN,
+    ATTR_LIMIT,
+    ATTR_RETRIES,
+    ATTR_SETTINGS,
+    ATTR_SLOW_THRESHOLD,
+    ATTR_TIMEOUT,
+    CONF_HOOK,
+    DATA_CONF,
+    DATA_HEALTH,
+    DATA_PROFILER,
+    DEFAULT_FLEET_LIMIT,
+    DEFAULT_ROLLOUT_CANARY,
+    DEFAULT_ROLLOUT_RETRIES,
+    DEFAULT_ROLLOUT_TIMEOUT,
+    DEFAULT_SCAN_TIMEOUT,
+    DOMAIN,
+    SERVICE_CONFIGURE_ALERTS,
+    SERVICE_HEALTH_REPORT,
+    SERVICE_PROFILE_START,
+    SERVICE_PROFILE_STOP,
+    SERVICE_ROLLOUT_SETTINGS,
+    SERVICE_SURVEY_WIFI,
+)
+from .fleet import (
+    async_configure_alerts,
+    async_get_fleet,
+    async_rollout_settings,
+    async_survey_wifi,
+)
+from .profiler import SLOW_CALLBACK_THRESHOLD
+
+SURVEY_WIFI_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DEVICES): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_LIMIT, default=DEFAULT_FLEET_LIMIT): vol.All(
+            vol.Coerce(int), vol.Range(min=1)
+        ),
+        vol.Optional(ATTR_TIMEOUT, default=DEFAULT_SCAN_TIMEOUT): vol.All(
+            vol.Coerce(float), vol.Range(min=1)
+        ),
+    }
+)
+
+ROLLOUT_SETTINGS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_SETTINGS): vol.All(dict, vol.Length(min=1)),
+        vol.Optional(ATTR_DEVICES): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_CANARY, default=DEFAULT_ROLLOUT_CANARY): vol.All(
+            vol.Coerce(int), vol.Range(min=0)
+        ),
+        vol.Optional(ATTR_LIMIT, default=DEFAULT_FLEET_LIMIT): vol.All(
+            vol.Coerce(int), vol.Range(min=1)
+        ),
+        vol.Optional(ATTR_TIMEOUT, default=DEFAULT_ROLLOUT_TIMEOUT): vol.All(
+            vol.Coerce(float), vol.Range(min=1)
+        ),
+        vol.Optional(ATTR_RETRIES, default=DEFAULT_ROLLOUT_RETRIES): vol.All(
+            vol.Coerce(int), vol.Range(min=0)
+        ),
+        vol.Optional(ATTR_DRY_RUN, default=False): cv.boolean,
+    }
+)
+
+CONFIGURE_ALERTS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_SETTINGS): dict,
+        vol.Optional(ATTR_DEVICES): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_LIMIT, default=DEFAULT_FLEET_LIMIT): vol.All(
+            vol.Coerce(int), vol.Range(min=1)
+        ),
+        vol.Optional(ATTR_TIMEOUT, default=DEFAULT_ROLLOUT_TIMEOUT): vol.All(
+            vol.Coerce(float), vol.Range(min=1)
+        ),
+    }
+)
+
+PROFILE_START_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_SLOW_THRESHOLD, default=SLOW_CALLBACK_THRESHOLD): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant):
+    """Register MyStrom Button Plus services."""
+
+    async def _async_survey_wifi(call: ServiceCall) -> ServiceResponse:
+        """Scan Wi-Fi on all (or the given) devices at once."""
+        fleet = async_get_fleet(hass, call.data.get(ATTR_DEVICES))
+        return await async_survey_wifi(
+            fleet, call.data[ATTR_LIMIT], call.data[ATTR_TIMEOUT]
+        )
+
+    async def _async_rollout_settings(call: ServiceCall) -> ServiceResponse:
+        """Push settings to all (or the given) devices."""
+        fleet = async_get_fleet(hass, call.data.get(ATTR_DEVICES))
+        return await async_rollout_settings(
+            fleet,
+            call.data[ATTR_SETTINGS],
+            call.data[ATTR_CANARY],
+            call.data[ATTR_LIMIT],
+            call.data[ATTR_TIMEOUT],
+            call.data[ATTR_RETRIES],
+            call.data[ATTR_DRY_RUN],
+        )
+
+    async def _async_configure_alerts(call: ServiceCall) -> ServiceResponse:
+        """Route threshold and battery alerts of all (or the given) devices."""
+        fleet = async_get_fleet(hass, call.data.get(ATTR_DEVICES))
+        return await async_configure_alerts(
+            fleet,
+            hass.data[DATA_CONF][CONF_HOOK],
+            call.data.get(ATTR_SETTINGS),
+            call.data[ATTR_LIMIT],
+            call.data[ATTR_TIMEOUT],
+        )
+
+    async def _async_profile_start(call: ServiceCall):
+        """Start recording timings and a profile."""
+        hass.data[DATA_CONF][DATA_PROFILER].start(call.data[ATTR_SLOW_THRESHOLD])
+
+    async def _async_profile_stop(call: ServiceCall) -> ServiceResponse:
+        """Stop recording and write the results next to the configuration."""
+        profiler = hass.data[DATA_CONF][DATA_PROFILER]
+        profile = profiler.stop()
+        stages = profiler.as_dict()
+
+        if profile is None:
+            return {"file": None, "stages": stages}
+
+        path = hass.config.path(f"{DOMAIN}_profile_{int(time.time())}")
+
+        def _dump():
+            profile.dump_stats(f"{path}.prof")
+            with open(f"{path}.json", "w", encoding="utf-8") as file:
+                json.dump(stages, file, indent=2)
+
+        await hass.async_add_executor_job(_dump)
+        return {"file": f"{path}.prof", "stages": stages}
+
+    async def _async_health_report(call: ServiceCall) -> ServiceResponse:
+        """Return the health state of every device."""
+        monitor = hass.data[DATA_CONF][DATA_HEALTH]
+        return {mac: state.as_dict() for mac, state in monitor.devices.items()}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SURVEY_WIFI,
+        _async_survey_wifi,
+        schema=SURVEY_WIFI_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_HEALTH_REPORT,
+        _async_health_report,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_ROLLOUT_SETTINGS,
+        _async_rollout_settings,
+        schema=ROLLOUT_SETTINGS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_CONFIGURE_ALERTS,
+        _async_configure_alerts,
+        schema=CONFIGURE_ALERTS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE_START,
+        _async_profile_start,
+        schema=PROFILE_START_SCHEMA,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE_STOP,
+        _async_profile_stop,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -0,0 +1,316 @@
+"""Standalone translator between MyStrom Button webhooks and MyStromListener.
+
+Buttons call the webhook (webhook_url in the configuration) on every action,
+the translator turns each call into a frame and fans it out to every
+WebSocket subscriber (websocket_url). It doesn't need Home Assistant, run it
+straight from the file:
+
+    python custom_components/mystrom118/translator.py --port 8118 --uvloop
+
+and point the integration at http://<host>:8118/webhook and
+ws://<host>:8118/ws. Every subscriber has its own bounded buffer; a slow
+subscriber loses its oldest frames instead of holding up the others.
+
+    python custom_components/mystrom118/translator.py --benchmark
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import time
+
+from aiohttp import ClientError, ClientSession, TCPConnector, WSMsgType, web
+
+try:
+    from .codec import FIELDS, available_protocols, encode
+except ImportError:  # started as a script
+    from codec import FIELDS, available_protocols, encode
+
+_LOGGER = logging.getLogger(__name__)
+
+NUMERIC_FIELDS = ("bat", "temp", "rh")
+
+
+def to_frame(params) -> dict:
+    """Build a frame from webhook parameters."""
+    frame = {field: params.get(field) for field in FIELDS}
+    if frame["mac"] is not None:
+        frame["mac"] = frame["mac"].replace(":", "").upper()
+
+    for field in NUMERIC_FIELDS:
+        try:
+            frame[field] = float(frame[field])
+        except (TypeError, ValueError):
+            frame[field] = None
+
+    return frame
+
+
+class Subscriber:
+    """A WebSocket client with its own bounded send buffer."""
+
+    def __init__(self, ws: web.WebSocketResponse, buffer: int):
+        """Initialize Subscriber."""
+        self.ws = ws
+        self.protocol = ws.ws_protocol
+        self.queue: asyncio.Queue = asyncio.Queue(buffer)
+        self.dropped = 0
+
+    def offer(self, payload: str | bytes):
+        """Queue a payload, dropping the oldest one if the buffer is full."""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(payload)
+
+    async def run(self, subscribers: set[Subscriber]):
+        """Send queued payloads until the connection goes away.
+
+        A failed send closes the connection and removes the subscriber from
+        subscribers, so nothing is queued for it anymore.
+        """
+        try:
+            while True:
+                payload = await self.queue.get()
+                if isinstance(payload, bytes):
+                    await self.ws.send_bytes(payload)
+                else:
+                    await self.ws.send_str(payload)
+        except (ConnectionResetError, ClientError, RuntimeError) as err:
+            _LOGGER.info("Sending to subscriber failed: %s", err)
+            subscribers.discard(self)
+            await self.ws.close()
+
+
+class Translator:
+    """Accepts webhook calls and fans them out to WebSocket subscribers."""
+
+    def __init__(self, buffer: int = 1000, compress: bool = True):
+        """Initialize Translator."""
+        self.buffer = buffer
+        self.compress = compress
+        self.subscribers: set[Subscriber] = set()
+        self.received = 0
+
+    def app(self, webhook_path: str = "/webhook", ws_path: str = "/ws"):
+        """Build the aiohttp application."""
+        app = web.Application()
+        app.router.add_route("*", webhook_path, self.handle_webhook)
+        app.router.add_get(ws_path, self.handle_ws)
+        app.router.add_get("/stats", self.handle_stats)
+        return app
+
+    def publish(self, frame: dict):
+        """Encode a frame once per protocol in use and queue it everywhere."""
+        self.received += 1
+        encoded = {}
+        for subscriber in self.subscribers:
+            payload = encoded.get(subscriber.protocol)
+            if payload is None:
+                payload = encoded[subscriber.protocol] = encode(
+                    frame, subscriber.protocol
+                )
+            subscriber.offer(payload)
+
+    async def handle_webhook(self, request: web.Request):
+        """Button called the webhook."""
+        params = dict(request.query)
+        if request.can_read_body:
+            if request.content_type == "application/json":
+                try:
+                    body = await request.json()
+                except ValueError as err:
+                    raise web.HTTPBadRequest(text="body is not valid JSON") from err
+                if not isinstance(body, dict):
+                    raise web.HTTPBadRequest(text="body must be a JSON object")
+                params.update(body)
+            else:
+                params.update(await request.post())
+
+        if not isinstance(params.get("mac"), str) or not isinstance(
+            params.get("action"), str
+        ):
+            raise web.HTTPBadRequest(text="mac and action are required strings")
+
+        self.publish(to_frame(params))
+        return web.Response()
+
+    async def handle_ws(self, request: web.Request):
+        """Subscriber connected."""
+        ws = web.WebSocketResponse(
+            protocols=available_protocols(),
+            compress=self.compress,
+            heartbeat=30,
+        )
+        await ws.prepare(request)
+
+        subscriber = Subscriber(ws, self.buffer)
+        self.subscribers.add(subscriber)
+        sender = asyncio.create_task(subscriber.run(self.subscribers))
+        _LOGGER.info(
+            "Subscriber %s connected using %s",
+            request.remote,
+            subscriber.protocol or "JSON",
+        )
+
+        try:
+            async for msg in ws:
+                if msg.type == WSMsgType.ERROR:
+                    break
+        finally:
+            self.subscribers.discard(subscriber)
+            sender.cancel()
+            _LOGGER.info(
+                "Subscriber %s left, %s frames dropped",
+                request.remote,
+                subscriber.dropped,
+            )
+
+        return ws
+
+    async def handle_stats(self, request: web.Request):
+        """Return counters."""
+        return web.json_response(
+            {
+                "received": self.received,
+                "subscribers": [
+                    {
+                        "protocol": sub.protocol,
+                        "queued": sub.queue.qsize(),
+                        "dropped": sub.dropped,
+                    }
+                    for sub in self.subscribers
+                ],
+            }
+        )
+
+
+async def serve(args: argparse.Namespace):
+    """Run the translator until cancelled."""
+    translator = Translator(args.buffer, not args.no_compress)
+    runner = web.AppRunner(translator.app(args.webhook_path, args.ws_path))
+    await runner.setup()
+    await web.TCPSite(runner, args.host, args.port, backlog=1024).start()
+    _LOGGER.info("Translator listening on %s:%s", args.host, args.port)
+
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+async def benchmark(args: argparse.Namespace):
+    """Measure webhook to subscriber throughput on the local machine."""
+    translator = Translator(max(args.buffer, args.events), not args.no_compress)
+    runner = web.AppRunner(translator.app(), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]  # pylint: disable=protected-access
+
+    async with ClientSession(connector=TCPConnector(limit=0)) as session:
+        received = [0] * args.subscribers
+        done = asyncio.Event()
+
+        async def subscribe(number: int, connected: asyncio.Event):
+            async with session.ws_connect(
+                f"http://127.0.0.1:{port}/ws", protocols=available_protocols()
+            ) as ws:
+                connected.set()
+                async for _ in ws:
+                    received[number] += 1
+                    if sum(received) == args.events * args.subscribers:
+                        done.set()
+
+        connected = [asyncio.Event() for _ in range(args.subscribers)]
+        subscribers = [
+            asyncio.create_task(subscribe(number, event))
+            for number, event in enumerate(connected)
+        ]
+        await asyncio.gather(*(event.wait() for event in connected))
+
+        semaphore = asyncio.Semaphore(args.concurrency)
+
+        async def press(number: int):
+            params = {
+                "mac": f"02C0FF{number % 1000:06X}",
+                "index": "1",
+                "action": "1",
+                "bat": "3.1",
+                "temp": "21.5",
+                "rh": "40",
+            }
+            async with semaphore, session.post(
+                f"http://127.0.0.1:{port}/webhook", data=params
+            ) as response:
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(press(number) for number in range(args.events)))
+        posted = time.perf_counter() - started
+        try:
+            await asyncio.wait_for(done.wait(), 60)
+        except asyncio.TimeoutError:
+            pass
+        delivered = time.perf_counter() - started
+
+        for task in subscribers:
+            task.cancel()
+
+    await runner.cleanup()
+
+    print(
+        f"{args.events} webhook calls in {posted:.2f} s ({args.events / posted:.0f}/s), "
+        f"{sum(received)} frames to {args.subscribers} subscribers in "
+        f"{delivered:.2f} s ({sum(received) / delivered:.0f}/s) "
+        f"using {available_protocols()[0]}"
+    )
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="0.0.0.0", help="address to listen on")
+    parser.add_argument("--port", type=int, default=8118, help="port to listen on")
+    parser.add_argument("--webhook-path", default="/webhook")
+    parser.add_argument("--ws-path", default="/ws")
+    parser.add_argument(
+        "--buffer", type=int, default=1000, help="frames buffered per subscriber"
+    )
+    parser.add_argument(
+        "--no-compress", action="store_true", help="disable permessage-deflate"
+    )
+    parser.add_argument("--uvloop", action="store_true", help="run on uvloop")
+    parser.add_argument(
+        "--benchmark", action="store_true", help="measure throughput and exit"
+    )
+    parser.add_argument("--events", type=int, default=10000, help="benchmark calls")
+    parser.add_argument("--subscribers", type=int, default=4)
+    parser.add_argument(
+        "--concurrency", type=int, default=100, help="parallel benchmark calls"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Run the translator."""
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    if args.uvloop:
+        try:
+            import uvloop  # pylint: disable=import-outside-toplevel
+
+            uvloop.install()
+        except ImportError:
+            _LOGGER.warning("uvloop is not installed, using the default event loop")
+
+    try:
+        asyncio.run(benchmark(args) if args.benchmark else serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""Soak test for MyStromListener against a flapping WebSocket server.
+
+A local aiohttp test server accepts a connection, sends a few frames (now and
+then a malformed one) and closes it again; every few connections it refuses
+the handshake instead. The listener reconnects without delay, so thousands
+of reconnect cycles run in seconds. After a warm-up, task count and
+tracemalloc snapshots are compared against the end of the run; the script
+exits non-zero when either grows beyond its bound or frames that were read
+never reached the callback, or when the listener stops reconnecting.
+
+    python scripts/listener_soak.py --cycles 10000 --max-memory-growth 512
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import logging
+from pathlib import Path
+import sys
+import time
+import tracemalloc
+import types
+
+from aiohttp import ClientSession, web
+from aiohttp.test_utils import TestServer
+
+PACKAGE_DIR = (
+    Path(__file__).resolve().parent.parent / "custom_components" / "mystrom118"
+)
+
+# Import the listener without the integration's __init__, which needs
+# Home Assistant
+package = types.ModuleType("mystrom118")
+package.__path__ = [str(PACKAGE_DIR)]
+sys.modules.setdefault("mystrom118", package)
+
+from mystrom118.MyStromAPIs import MyStromListener  # noqa: E402
+
+FRAME = '{"mac":"02C0FF000001","index":"1","action":"1","bat":3.1,"temp":21.5,"rh":40}'
+
+
+class FlappingServer:
+    """WebSocket server that drops every connection after a few frames."""
+
+    def __init__(self, frames: int, refuse_every: int, garbage_every: int):
+        """Initialize FlappingServer."""
+        self.frames = frames
+        self.refuse_every = refuse_every
+        self.garbage_every = garbage_every
+        self.connections = 0
+        self.sent = 0
+
+    async def handle(self, request: web.Request):
+        """Send a few frames, then hang up."""
+        self.connections += 1
+        if self.refuse_every and self.connections % self.refuse_every == 0:
+            raise web.HTTPServiceUnavailable()
+
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+
+        for _ in range(self.frames):
+            await ws.send_str(FRAME)
+            self.sent += 1
+        if self.garbage_every and self.connections % self.garbage_every == 0:
+            await ws.send_str("{not json")
+
+        await ws.close()
+        return ws
+
+
+async def wait_for_cycles(server: FlappingServer, cycles: int, timeout: float) -> bool:
+    """Wait until the server has seen cycles more connections.
+
+    Returns False if the listener didn't get there within timeout seconds,
+    i.e. it stopped reconnecting.
+    """
+    target = server.connections + cycles
+    deadline = time.monotonic() + timeout
+    while server.connections < target:
+        if time.monotonic() > deadline:
+            return False
+        await asyncio.sleep(0.05)
+    return True
+
+
+def snapshot():
+    """Return task count and a tracemalloc snapshot after a full collection."""
+    gc.collect()
+    return len(asyncio.all_tasks()), tracemalloc.take_snapshot()
+
+
+async def soak(args: argparse.Namespace) -> list[str]:
+    """Run the soak test, return the bounds that were exceeded."""
+    server = FlappingServer(args.frames, args.refuse_every, args.garbage_every)
+    app = web.Application()
+    app.router.add_get("/ws", server.handle)
+
+    received = 0
+
+    async def callback(data):
+        nonlocal received
+        received += 1
+
+    async with TestServer(app) as test_server, ClientSession() as session:
+        listener = MyStromListener(
+            str(test_server.make_url("/ws")), session, asyncio.get_running_loop()
+        )
+        listener.reconnect_delay = 0
+        remove_callback = listener.add_callback(callback)
+        listener.create_loop_task()
+
+        if not await wait_for_cycles(
+            server, args.warmup, args.warmup * args.cycle_timeout
+        ):
+            await listener.async_stop(5)
+            return [f"stuck after {server.connections} connections during warm-up"]
+
+        tracemalloc.start()
+        tasks_before, memory_before = snapshot()
+
+        completed = await wait_for_cycles(
+            server, args.cycles, args.cycles * args.cycle_timeout
+        )
+        tasks_after, memory_after = snapshot()
+        tracemalloc.stop()
+
+        await listener.async_stop(5)
+        remove_callback()
+
+    stats = memory_after.compare_to(memory_before, "lineno")
+    growth = sum(stat.size_diff for stat in stats) / 1024
+
+    print(
+        f"{server.connections} connections, {server.sent} frames sent, "
+        f"{listener.messages} read, {received} dispatched, "
+        f"{listener.dropped} malformed dropped"
+    )
+    print(f"tasks: {tasks_before} -> {tasks_after}, memory growth: {growth:.1f} KiB")
+    for stat in stats[: args.top]:
+        print(f"  {stat}")
+
+    failures = []
+    if not completed:
+        failures.append(
+            f"listener stopped reconnecting after {server.connections} connections"
+        )
+    if tasks_after - tasks_before > args.max_task_growth:
+        failures.append(f"task count grew by {tasks_after - tasks_before}")
+    if growth > args.max_memory_growth:
+        failures.append(f"memory grew by {growth:.1f} KiB")
+    if received != listener.messages:
+        failures.append(f"{listener.messages - received} frames were not dispatched")
+    if listener.callbacks:
+        failures.append(f"{len(listener.callbacks)} callbacks left registered")
+    return failures
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cycles", type=int, default=2000, help="reconnect cycles")
+    parser.add_argument(
+        "--warmup", type=int, default=500, help="cycles before measuring"
+    )
+    parser.add_argument("--frames", type=int, default=5, help="frames per connection")
+    parser.add_argument(
+        "--refuse-every", type=int, default=7, help="refuse every n-th handshake"
+    )
+    parser.add_argument(
+        "--garbage-every",
+        type=int,
+        default=11,
+        help="malformed frame every n-th connection",
+    )
+    # The connection in flight when sampling holds a task and its deflate
+    # buffers; a leak grows with the number of cycles instead
+    parser.add_argument("--max-task-growth", type=int, default=2)
+    parser.add_argument("--max-memory-growth", type=float, default=1024, help="KiB")
+    parser.add_argument(
+        "--cycle-timeout",
+        type=float,
+        default=0.1,
+        help="seconds allowed per cycle before the run counts as stuck",
+    )
+    parser.add_argument("--top", type=int, default=5, help="allocation sites to show")
+    parser.add_argument("--verbose", action="store_true", help="show listener logs")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    """Run the soak test."""
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.CRITICAL)
+
+    failures = asyncio.run(soak(args))
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("OK")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,359 @@
+"""Simulates a fleet of MyStrom Button Plus devices for offline testing.
+
+Every virtual device serves the HTTP API under /api/v1 and announces itself
+with discovery broadcasts on UDP 7979, just like the real thing.
+
+By default each device gets its own port on 127.0.0.1 (point MyStromAPI at
+"127.0.0.1:<port>"). With --loopback every device instead gets its own
+127.0.x.y address on the same port, so discovery broadcasts carry a usable
+source address as well.
+
+    python scripts/mystrom_simulator.py --devices 300 --latency 20 --error-rate 0.01
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import socket
+
+from aiohttp import web
+
+_LOGGER = logging.getLogger(__name__)
+
+DEVICE_TYPE = 118
+DISCOVERY_PORT = 7979
+FIRMWARE = "2.74.31"
+
+COMPONENTS = (
+    "generic",
+    "button1",
+    "button2",
+    "button3",
+    "button4",
+    "temperature",
+    "humidity",
+)
+ACTIONS = (
+    "single",
+    "double",
+    "long",
+    "battery",
+    "generic",
+    "over_value",
+    "under_value",
+)
+SSIDS = ("office", "office-guest", "warehouse", "lab", "printer-direct")
+
+
+class VirtualDevice:
+    """State of a single simulated device."""
+
+    def __init__(self, number: int, ip: str, port: int, rng: random.Random):
+        """Initialize VirtualDevice."""
+        self.mac = f"02C0FF{number:06X}"
+        self.ip = ip
+        self.port = port
+        self.rng = rng
+        self.settings = {
+            "name": f"Button {number}",
+            "temp_offset": 0,
+            "rh_offset": 0,
+            "led": True,
+        }
+        self.actions = {component: {} for component in COMPONENTS}
+        self.ssid = rng.choice(SSIDS)
+        self.aps = [(ssid, rng.randint(-90, -40)) for ssid in SSIDS]
+
+    def info(self) -> dict:
+        """Return /info payload."""
+        return {
+            "version": FIRMWARE,
+            "mac": self.mac,
+            "type": DEVICE_TYPE,
+            "ssid": self.ssid,
+            "ip": self.ip,
+            "mask": "255.255.255.0",
+            "gw": "192.168.1.1",
+            "dns": "192.168.1.1",
+            "static": False,
+            "connected": True,
+        }
+
+    def sensors(self) -> dict:
+        """Return /sensors payload."""
+        return {
+            "temperature": round(self.rng.uniform(18, 26), 2),
+            "humidity": round(self.rng.uniform(30, 60), 2),
+            "battery": round(self.rng.uniform(2.6, 3.2), 2),
+        }
+
+    def scan(self) -> list:
+        """Return /scan payload, a flat list of SSID and strength."""
+        result = []
+        for ssid, strength in self.aps:
+            result += [ssid, strength + self.rng.randint(-3, 3)]
+        return result
+
+    def announcement(self) -> bytes:
+        """Return discovery broadcast payload."""
+        return bytes.fromhex(self.mac) + bytes([DEVICE_TYPE, 0b111])
+
+
+class Simulator:
+    """Serves all virtual devices from one aiohttp application."""
+
+    def __init__(self, args: argparse.Namespace):
+        """Initialize Simulator."""
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.devices: dict[tuple[str, int], VirtualDevice] = {}
+        self.requests = 0
+
+        for number in range(1, args.devices + 1):
+            if args.loopback:
+                ip, port = f"127.0.{number // 250 + 1}.{number % 250 + 1}", args.port
+            else:
+                ip, port = args.host, args.port + number - 1
+            device = VirtualDevice(
+                number, ip, port, random.Random(f"{args.seed}-{number}")
+            )
+            self.devices[(ip, port)] = device
+
+    def app(self) -> web.Application:
+        """Build the aiohttp application."""
+        app = web.Application(middlewares=[self.fault_middleware])
+        app.router.add_get("/api/v1/info", self.handle_info)
+        app.router.add_get("/api/v1/settings", self.handle_get_settings)
+        app.router.add_post("/api/v1/settings", self.handle_set_settings)
+        app.router.add_get("/api/v1/scan", self.handle_scan)
+        app.router.add_post("/api/v1/connect", self.handle_connect)
+        app.router.add_get("/api/v1/sensors", self.handle_sensors)
+        app.router.add_get("/api/v1/meas", self.handle_meas)
+        app.router.add_get("/api/v1/actions", self.handle_actions)
+        app.router.add_get("/api/v1/actions/{component}", self.handle_component_actions)
+        app.router.add_get(
+            "/api/v1/action/{component}/{action}", self.handle_get_action
+        )
+        app.router.add_post(
+            "/api/v1/action/{component}/{action}", self.handle_set_action
+        )
+        return app
+
+    def device(self, request: web.Request) -> VirtualDevice:
+        """Find the device a request was sent to by its local address."""
+        ip, port = request.transport.get_extra_info("sockname")[:2]
+        if not self.args.loopback:
+            # One device per port; --host may be a wildcard like 0.0.0.0
+            ip = self.args.host
+        return self.devices[(ip, port)]
+
+    @web.middleware
+    async def fault_middleware(self, request: web.Request, handler):
+        """Inject latency, errors and timeouts."""
+        self.requests += 1
+        args = self.args
+
+        delay = args.latency + self.rng.uniform(0, args.jitter)
+        if delay:
+            await asyncio.sleep(delay / 1000)
+
+        roll = self.rng.random()
+        if roll < args.timeout_rate:
+            await asyncio.sleep(3600)
+        if roll < args.timeout_rate + args.error_rate:
+            raise web.HTTPInternalServerError()
+
+        return await handler(request)
+
+    async def handle_info(self, request):
+        """GET /info, reporting the address the request arrived on."""
+        ip = request.transport.get_extra_info("sockname")[0]
+        return web.json_response({**self.device(request).info(), "ip": ip})
+
+    async def handle_get_settings(self, request):
+        """GET /settings."""
+        return web.json_response(self.device(request).settings)
+
+    async def handle_set_settings(self, request):
+        """POST /settings."""
+        device = self.device(request)
+        try:
+            device.settings.update(await request.json())
+        except (ValueError, TypeError, AttributeError) as err:
+            raise web.HTTPBadRequest() from err
+        return web.json_response(device.settings)
+
+    async def handle_scan(self, request):
+        """GET /scan."""
+        await asyncio.sleep(self.args.scan_time / 1000)
+        return web.json_response(self.device(request).scan())
+
+    async def handle_connect(self, request):
+        """POST /connect."""
+        payload = await request.json()
+        self.device(request).ssid = payload.get("ssid", "")
+        return web.json_response({})
+
+    async def handle_sensors(self, request):
+        """GET /sensors."""
+        return web.json_response(self.device(request).sensors())
+
+    async def handle_meas(self, request):
+        """GET /meas."""
+        device = self.device(request)
+        return web.json_response([device.sensors() for _ in range(24)])
+
+    async def handle_actions(self, request):
+        """GET /actions."""
+        return web.json_response(self.device(request).actions)
+
+    async def handle_component_actions(self, request):
+        """GET /actions/{component}."""
+        actions = self.device(request).actions
+        component = request.match_info["component"]
+        if component not in actions:
+            raise web.HTTPNotFound()
+        return web.json_response(actions[component])
+
+    async def handle_get_action(self, request):
+        """GET /action/{component}/{action}."""
+        actions = self.device(request).actions
+        component, action = (
+            request.match_info["component"],
+            request.match_info["action"],
+        )
+        if component not in actions or action not in ACTIONS:
+            raise web.HTTPNotFound()
+        return web.json_response({action: actions[component].get(action, "")})
+
+    async def handle_set_action(self, request):
+        """POST /action/{component}/{action}, the body is the URL to call."""
+        actions = self.device(request).actions
+        component, action = (
+            request.match_info["component"],
+            request.match_info["action"],
+        )
+        if component not in actions or action not in ACTIONS:
+            raise web.HTTPNotFound()
+        actions[component][action] = await request.text()
+        return web.json_response({})
+
+    async def announce(self):
+        """Send discovery broadcasts for all devices, forever."""
+        sockets = {}
+        for device in self.devices.values():
+            if device.ip in sockets:
+                continue
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+            sock.bind((device.ip, 0))
+            sock.setblocking(False)
+            sockets[device.ip] = sock
+
+        target = (self.args.broadcast, DISCOVERY_PORT)
+        try:
+            while True:
+                for device in self.devices.values():
+                    try:
+                        sockets[device.ip].sendto(device.announcement(), target)
+                    except OSError:
+                        _LOGGER.debug(
+                            "Broadcast from %s failed", device.ip, exc_info=True
+                        )
+                await asyncio.sleep(self.args.announce_interval)
+        finally:
+            for sock in sockets.values():
+                sock.close()
+
+    async def run(self):
+        """Serve all devices until cancelled."""
+        runner = web.AppRunner(self.app(), access_log=None)
+        await runner.setup()
+
+        for ip, port in self.devices:
+            await web.TCPSite(runner, ip, port, backlog=1024).start()
+
+        _LOGGER.info(
+            "Serving %s devices (first: %s)",
+            len(self.devices),
+            ", ".join(f"{ip}:{port}" for ip, port in list(self.devices)[:3]),
+        )
+
+        announcer = asyncio.create_task(self.announce())
+        try:
+            await asyncio.Event().wait()
+        finally:
+            announcer.cancel()
+            await runner.cleanup()
+
+    def dump(self) -> str:
+        """Return MAC and address of every device as JSON."""
+        return json.dumps(
+            [{"mac": d.mac, "ip": d.ip, "port": d.port} for d in self.devices.values()],
+            indent=2,
+        )
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=100, help="number of devices")
+    parser.add_argument("--host", default="127.0.0.1", help="address to serve on")
+    parser.add_argument("--port", type=int, default=18000, help="first port")
+    parser.add_argument(
+        "--loopback",
+        action="store_true",
+        help="give every device its own 127.0.x.y address on --port",
+    )
+    parser.add_argument("--latency", type=float, default=0, help="base latency in ms")
+    parser.add_argument(
+        "--jitter", type=float, default=0, help="random extra latency in ms"
+    )
+    parser.add_argument(
+        "--scan-time", type=float, default=2000, help="duration of /scan in ms"
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0,
+        help="share of requests answered with 500",
+    )
+    parser.add_argument(
+        "--timeout-rate", type=float, default=0, help="share of requests never answered"
+    )
+    parser.add_argument(
+        "--seed", type=int, default=118, help="seed for reproducible runs"
+    )
+    parser.add_argument(
+        "--broadcast", default="255.255.255.255", help="discovery target address"
+    )
+    parser.add_argument(
+        "--announce-interval", type=float, default=5, help="seconds between broadcasts"
+    )
+    parser.add_argument(
+        "--list", action="store_true", help="print devices as JSON and exit"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Run the simulator."""
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    simulator = Simulator(args)
+
+    if args.list:
+        print(simulator.dump())
+        return
+
+    try:
+        asyncio.run(simulator.run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()